@@ -145,6 +145,10 @@ class BeepDetector:
         self.beep_expected = False
         self.silence_start = None
 
+        # Last frame's spectral features, kept for result/feature sinks
+        self.last_freq = None
+        self.last_spectral_ratio = None
+
     def _detect_tone_frequency(self, frame):
         """
         Detect dominant frequency and spectral concentration.
@@ -196,6 +200,8 @@ class BeepDetector:
             self.beep_expected = mentions_beep(transcript)
 
         freq, spectral_ratio = self._detect_tone_frequency(frame)
+        self.last_freq = freq
+        self.last_spectral_ratio = spectral_ratio
 
         if freq is None:
             self.count = 0
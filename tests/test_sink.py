@@ -0,0 +1,118 @@
+import csv
+import os
+
+import numpy as np
+import pytest
+
+from utils.sink import ResultSink, load_npz
+
+
+def read_csv(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_results_round_trip_csv(tmp_path):
+    with ResultSink(tmp_path, fmt="csv") as sink:
+        sink.add_result("vm1", "BEEP", 4.3, 4.27)
+        sink.add_result("vm2", None, None)
+
+    (path,) = sink.results.files
+    rows = read_csv(path)
+    assert rows[0]["reason"] == "BEEP"
+    assert float(rows[0]["beep_time"]) == pytest.approx(4.27)
+    assert rows[1]["reason"] == ""
+    assert np.isnan(float(rows[1]["trigger_time"]))
+    assert not any(name.endswith(".tmp") for name in os.listdir(tmp_path))
+
+
+def test_frames_npz_batches_share_a_part(tmp_path):
+    with ResultSink(tmp_path, fmt="npz", batch_size=4, record_frames=True) as sink:
+        for i in range(10):
+            sink.add_frame("vm1", i * 0.02, i % 2 == 0, None if i == 0 else 1000.0, 0.5, 0.0)
+
+    (path,) = sink.frames.files
+    part = load_npz(path)
+    assert len(part["time"]) == 10
+    assert part["vad"].tolist()[:4] == [True, False, True, False]
+    assert np.isnan(part["dominant_freq"][0])
+    assert part["call_id"][0] == "vm1"
+
+
+def test_npz_missing_strings_are_empty(tmp_path):
+    with ResultSink(tmp_path, fmt="npz") as sink:
+        sink.add_result("vm2", None, None)
+
+    part = load_npz(sink.results.files[0])
+    assert part["reason"].tolist() == [""]
+    assert np.isnan(part["trigger_time"][0])
+
+
+def test_parquet_missing_strings_are_null(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    with ResultSink(tmp_path, fmt="parquet") as sink:
+        sink.add_result("vm1", "GREETING_END", 3.8, None, "goodbye")
+        sink.add_result("vm2", None, None)
+
+    table = pq.read_table(sink.results.files[0])
+    assert table.column("reason").to_pylist() == ["GREETING_END", None]
+    assert table.column("detected_phrase").to_pylist() == ["goodbye", None]
+
+
+def test_frames_skipped_unless_recorded(tmp_path):
+    with ResultSink(tmp_path, fmt="csv") as sink:
+        sink.add_frame("vm1", 0.0, True, 1000.0, 0.5, 0.0)
+    assert sink.frames.files == []
+
+
+@pytest.mark.parametrize("fmt", ["csv", "npz"])
+def test_rotates_by_size(tmp_path, fmt):
+    with ResultSink(tmp_path, fmt=fmt, batch_size=100, max_file_mb=0.01) as sink:
+        for i in range(1000):
+            sink.add_result(f"vm{i}", "TIMEOUT", 3.0)
+
+    files = sink.results.files
+    assert 1 < len(files) < 10
+    if fmt == "csv":
+        assert sum(len(read_csv(p)) for p in files) == 1000
+    else:
+        assert sum(len(load_npz(p)["call_id"]) for p in files) == 1000
+
+
+def test_two_sinks_do_not_overwrite(tmp_path):
+    for call in ("a", "b"):
+        with ResultSink(tmp_path, fmt="csv") as sink:
+            sink.add_result(call, "BEEP", 1.0)
+
+    parts = sorted(os.listdir(tmp_path))
+    assert len(parts) == 2
+    calls = {read_csv(tmp_path / p)[0]["call_id"] for p in parts}
+    assert calls == {"a", "b"}
+
+
+def read_calls(path):
+    if path.suffix == ".csv":
+        return [row["call_id"] for row in read_csv(path)]
+    return load_npz(path)["call_id"].tolist()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork()")
+@pytest.mark.parametrize("fmt", ["csv", "npz"])
+def test_forked_child_drops_inherited_rows(tmp_path, fmt):
+    sink = ResultSink(tmp_path, fmt=fmt)
+    sink.add_result("parent", "BEEP", 1.0)
+    sink.flush()
+    sink.add_result("parent-pending", "BEEP", 2.0)
+
+    pid = os.fork()
+    if pid == 0:
+        try:
+            sink.add_result("child", "TIMEOUT", 3.0)
+            sink.close()
+        finally:
+            os._exit(0)
+    os.waitpid(pid, 0)
+    sink.close()
+
+    calls = sorted(c for p in os.listdir(tmp_path) for c in read_calls(tmp_path / p))
+    assert calls == ["child", "parent", "parent-pending"]
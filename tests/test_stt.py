@@ -0,0 +1,157 @@
+import gc
+import importlib
+import sys
+import threading
+import types
+
+import pytest
+
+MB = 1024 * 1024
+
+
+class FakeModel:
+    """Stand-in for vosk.Model that tracks how much model memory is live."""
+    live = 0
+    peak = 0
+    barrier = None
+
+    def __init__(self, path):
+        if path.endswith("missing"):
+            raise RuntimeError("cannot load model")
+        self.path = path
+        FakeModel.live += 40 * MB
+        FakeModel.peak = max(FakeModel.peak, FakeModel.live)
+        if FakeModel.barrier is not None:
+            FakeModel.barrier.wait(timeout=5)
+
+    def __del__(self):
+        FakeModel.live -= 40 * MB
+
+
+class FakeRecognizer:
+    def __init__(self, model, sr):
+        self.model = model
+        self.sr = sr
+
+
+@pytest.fixture
+def stt(monkeypatch):
+    try:
+        import vosk  # noqa: F401
+        stubbed = False
+    except ImportError:
+        # Stub vosk only while utils.stt is imported for this test
+        monkeypatch.setitem(sys.modules, "vosk", types.SimpleNamespace(Model=None, KaldiRecognizer=None))
+        sys.modules.pop("utils.stt", None)
+        stubbed = True
+    module = importlib.import_module("utils.stt")
+    yield module
+    if stubbed:
+        sys.modules.pop("utils.stt", None)
+
+
+@pytest.fixture
+def registry(stt, monkeypatch):
+    monkeypatch.setattr(stt, "Model", FakeModel)
+    monkeypatch.setattr(stt, "KaldiRecognizer", FakeRecognizer)
+    # A missing directory has no files, like the real footprint estimate
+    monkeypatch.setattr(stt, "_model_footprint", lambda path: 0 if path.endswith("missing") else 40 * MB)
+    gc.collect()
+    FakeModel.live = FakeModel.peak = 0
+    FakeModel.barrier = None
+    paths = {"en": "m/en", "es": "m/es", "fr": "m/fr", "de": "m/de", "bad": "m/missing"}
+    return stt.ModelRegistry(paths, memory_budget_mb=100)
+
+
+def test_hits_and_misses(registry):
+    registry.create_recognizer("en")
+    registry.create_recognizer("en")
+    stats = registry.stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+    assert stats["models"]["en"]["load_time"] >= 0
+
+
+def test_evicts_least_recently_used(registry):
+    registry.create_recognizer("en")
+    registry.create_recognizer("es")
+    registry.create_recognizer("en")  # "es" is now least recently used
+    gc.collect()
+    registry.create_recognizer("fr")
+    assert set(registry.stats()["models"]) == {"en", "fr"}
+    assert registry.evictions == 1
+
+
+def test_live_recognizer_pins_model(registry):
+    keep = registry.create_recognizer("en")
+    registry.create_recognizer("es")
+    gc.collect()
+    registry.create_recognizer("fr")
+    assert set(registry.stats()["models"]) == {"en", "fr"}
+    assert keep.model.path == "m/en"
+
+
+def test_over_budget_until_recognizers_released(registry):
+    pinned = [registry.create_recognizer(k) for k in ("en", "es", "fr")]
+    stats = registry.stats()
+    assert stats["over_budget"]
+    assert stats["over_budget_loads"] == 1
+
+    del pinned
+    gc.collect()
+    stats = registry.stats()
+    assert not stats["over_budget"]
+    assert stats["resident_bytes"] <= stats["memory_budget_bytes"]
+
+
+def test_failed_load_evicts_nothing(registry):
+    registry.create_recognizer("en")
+    registry.create_recognizer("es")
+    gc.collect()
+    with pytest.raises(RuntimeError):
+        registry.create_recognizer("bad")
+    assert set(registry.stats()["models"]) == {"en", "es"}
+    assert registry.evictions == 0
+
+
+def test_unknown_key(registry):
+    with pytest.raises(KeyError):
+        registry.create_recognizer("it")
+
+
+def test_single_miss_stays_within_budget(registry):
+    registry.create_recognizer("en")
+    registry.create_recognizer("es")
+    gc.collect()
+    registry.create_recognizer("fr")
+    assert FakeModel.peak <= registry.memory_budget
+
+
+def test_concurrent_misses_stay_within_budget(registry):
+    registry.create_recognizer("en")
+    registry.create_recognizer("es")
+    gc.collect()
+    FakeModel.barrier = threading.Barrier(2)
+
+    threads = [threading.Thread(target=registry.create_recognizer, args=(k,)) for k in ("fr", "de")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert set(registry.stats()["models"]) == {"fr", "de"}
+    assert FakeModel.peak <= registry.memory_budget
+
+
+def test_register_replaces_idle_model(registry):
+    registry.create_recognizer("es")
+    gc.collect()
+    registry.register("es", "m/es-new")
+    assert registry.create_recognizer("es").model.path == "m/es-new"
+
+
+def test_register_refuses_pinned_model(registry):
+    keep = registry.create_recognizer("es")
+    with pytest.raises(ValueError):
+        registry.register("es", "m/es-new")
+    assert keep.model.path == "m/es"
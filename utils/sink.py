@@ -0,0 +1,296 @@
+import csv
+import os
+import uuid
+import weakref
+import zipfile
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional
+    pa = None
+
+RESULT_COLUMNS = [
+    ("call_id", "str"),
+    ("reason", "str"),
+    ("trigger_time", "f8"),
+    ("beep_time", "f8"),
+    ("detected_phrase", "str"),
+]
+
+FRAME_COLUMNS = [
+    ("call_id", "str"),
+    ("time", "f8"),
+    ("vad", "bool"),
+    ("dominant_freq", "f8"),
+    ("spectral_ratio", "f8"),
+    ("silence_since", "f8"),
+]
+
+FORMATS = ("parquet", "arrow", "npz", "csv")
+EXTENSIONS = {"parquet": "parquet", "arrow": "arrow", "npz": "npz", "csv": "csv"}
+
+
+def default_format():
+    """Best columnar format available in this environment."""
+    return "parquet" if pa is not None else "npz"
+
+
+def _nan(value):
+    return np.nan if value is None else value
+
+
+def load_npz(path):
+    """Read an NPZ part written by the sink, joining its batches per column."""
+    columns = {}
+    with np.load(path) as data:
+        for key in sorted(data.files):
+            _, column = key.split("/", 1)
+            columns.setdefault(column, []).append(data[key])
+    return {c: np.concatenate(batches) for c, batches in columns.items()}
+
+
+_sinks = weakref.WeakSet()
+
+
+def _after_fork_in_child():
+    for sink in list(_sinks):
+        sink._reset_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+class _TableWriter:
+    """
+    Appends column batches to size-rotated part files.
+
+    File names carry the pid and a random per-writer token, so several sinks,
+    processes or hosts can share one output directory without locking. Parts
+    are written under a `.tmp` name and linked to their final name once
+    closed, so readers never see a partial file and nothing is overwritten.
+    """
+    def __init__(self, output_dir, name, columns, fmt, max_bytes):
+        self.output_dir = output_dir
+        self.name = name
+        self.columns = columns
+        self.fmt = fmt
+        self.max_bytes = max_bytes
+        self.token = uuid.uuid4().hex
+        self.seq = 0
+        self.batch = 0
+        self.path = None
+        self.handle = None
+        self._file = None
+        self.files = []
+
+        if fmt in ("parquet", "arrow"):
+            types = {"str": pa.string(), "f8": pa.float64(), "bool": pa.bool_()}
+            self.schema = pa.schema([(c, types[k]) for c, k in columns])
+
+    def write(self, data):
+        if self.path is None:
+            self._open()
+
+        if self.fmt in ("parquet", "arrow"):
+            self.handle.write_table(self._to_arrow(data))
+        elif self.fmt == "csv":
+            self.handle.writerows(zip(*(data[c].tolist() for c, _ in self.columns)))
+            self._file.flush()
+        else:
+            # Each batch becomes its own set of members, "<batch>/<column>.npy"
+            for c, _ in self.columns:
+                with self.handle.open(f"{self.batch:05d}/{c}.npy", "w", force_zip64=True) as member:
+                    np.lib.format.write_array(member, np.asarray(data[c]), allow_pickle=False)
+            self.batch += 1
+            self._file.flush()
+
+        if os.path.getsize(self.path) >= self.max_bytes:
+            self._close()
+
+    def close(self):
+        if self.path is not None:
+            self._close()
+
+    def detach(self):
+        """Drop an open part inherited from a parent process without touching it."""
+        if self._file is not None:
+            # Close only this process's descriptor first, so any close logic a
+            # writer runs later (including its finalizer) cannot reach the
+            # parent's file. Nothing is buffered: every write is flushed.
+            self._file.close()
+        if self.fmt == "parquet" and self.handle is not None:
+            self.handle.is_open = False
+        elif self.fmt == "npz" and self.handle is not None:
+            self.handle.fp = None  # ZipFile.close() is a no-op without a file
+        self.path = None
+        self.handle = None
+        self._file = None
+        self.token = uuid.uuid4().hex
+        self.seq = 0
+        self.files = []
+
+    def _to_arrow(self, data):
+        arrays = [
+            pa.array(data[c], type=self.schema.field(c).type, from_pandas=True)
+            for c, _ in self.columns
+        ]
+        return pa.Table.from_arrays(arrays, schema=self.schema)
+
+    def _part_name(self):
+        name = f"{self.name}-{os.getpid()}-{self.token}-{self.seq:05d}.{EXTENSIONS[self.fmt]}"
+        self.seq += 1
+        return os.path.join(self.output_dir, name)
+
+    def _open(self):
+        self.path = self._part_name() + ".tmp"
+        self.batch = 0
+
+        if self.fmt == "parquet":
+            self._file = pa.OSFile(self.path, "wb")
+            self.handle = pq.ParquetWriter(self._file, self.schema)
+        elif self.fmt == "arrow":
+            self._file = pa.OSFile(self.path, "wb")
+            self.handle = pa_ipc.new_file(self._file, self.schema)
+        elif self.fmt == "csv":
+            self._file = open(self.path, "w", newline="")
+            self.handle = csv.writer(self._file)
+            self.handle.writerow([c for c, _ in self.columns])
+        else:
+            self._file = open(self.path, "wb")
+            self.handle = zipfile.ZipFile(self._file, "w")
+
+    def _close(self):
+        if self.fmt != "csv":
+            self.handle.close()
+        if self._file is not None:
+            self._file.close()
+        final = self.path[: -len(".tmp")]
+        # link() fails instead of replacing an existing file
+        while True:
+            try:
+                os.link(self.path, final)
+                break
+            except FileExistsError:
+                final = self._part_name()
+        os.unlink(self.path)
+        self.files.append(final)
+        self.path = None
+        self.handle = None
+        self._file = None
+
+
+class ResultSink:
+    """
+    Buffers per-call decisions and per-frame signals, flushing them in batches.
+
+    Frame signals go into preallocated NumPy columns, so recording a frame is a
+    handful of array stores. Batches are written as Parquet or Arrow IPC when
+    pyarrow is installed, otherwise NPZ (read back with `load_npz`); CSV can
+    be requested explicitly. Missing strings are nulls in Parquet and Arrow
+    and empty strings in NPZ and CSV.
+
+    A sink that is inherited through fork() starts over in the child: rows
+    buffered by the parent and its open part files are left to the parent.
+    Creating the sink inside each worker avoids that hand-off entirely.
+    """
+    def __init__(self, output_dir="results", fmt=None, batch_size=8192,
+                 max_file_mb=64, record_frames=False):
+        fmt = fmt or default_format()
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported format '{fmt}', expected one of {FORMATS}")
+        if fmt in ("parquet", "arrow") and pa is None:
+            raise ValueError(f"Format '{fmt}' requires pyarrow")
+
+        os.makedirs(output_dir, exist_ok=True)
+        max_bytes = int(max_file_mb * 1024 * 1024)
+        self.fmt = fmt
+        self.batch_size = batch_size
+        self.record_frames = record_frames
+
+        self.results = _TableWriter(output_dir, "results", RESULT_COLUMNS, fmt, max_bytes)
+        self.frames = _TableWriter(output_dir, "frames", FRAME_COLUMNS, fmt, max_bytes)
+
+        self._result_rows = []
+        self._frame_buf = {
+            c: np.empty(batch_size, dtype=object if k == "str" else k)
+            for c, k in FRAME_COLUMNS
+        }
+        self._frame_count = 0
+        _sinks.add(self)
+
+    def add_result(self, call_id, reason, trigger_time, beep_time=None, detected_phrase=None):
+        """Record the playback decision for one call."""
+        self._result_rows.append(
+            (call_id, reason, _nan(trigger_time), _nan(beep_time), detected_phrase)
+        )
+        if len(self._result_rows) >= self.batch_size:
+            self._flush_results()
+
+    def add_frame(self, call_id, time, vad, dominant_freq, spectral_ratio, silence_since):
+        """Record the signals of one frame. No-op unless `record_frames` is set."""
+        if not self.record_frames:
+            return
+        i = self._frame_count
+        buf = self._frame_buf
+        buf["call_id"][i] = call_id
+        buf["time"][i] = time
+        buf["vad"][i] = vad
+        buf["dominant_freq"][i] = _nan(dominant_freq)
+        buf["spectral_ratio"][i] = _nan(spectral_ratio)
+        buf["silence_since"][i] = silence_since
+        self._frame_count = i + 1
+        if self._frame_count >= self.batch_size:
+            self._flush_frames()
+
+    def flush(self):
+        self._flush_results()
+        self._flush_frames()
+
+    def close(self):
+        """Flush pending rows and finalize all open part files."""
+        self.flush()
+        self.results.close()
+        self.frames.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _reset_after_fork(self):
+        self._result_rows = []
+        self._frame_count = 0
+        self.results.detach()
+        self.frames.detach()
+
+    def _flush_results(self):
+        if not self._result_rows:
+            return
+        cols = list(zip(*self._result_rows))
+        data = {}
+        for (c, k), values in zip(RESULT_COLUMNS, cols):
+            if k != "str":
+                data[c] = np.array(values, dtype=k)
+            elif self.fmt in ("parquet", "arrow"):
+                # Arrow keeps missing strings as nulls
+                data[c] = np.array(values, dtype=object)
+            else:
+                data[c] = np.array(["" if v is None else v for v in values], dtype=str)
+        self.results.write(data)
+        self._result_rows = []
+
+    def _flush_frames(self):
+        n = self._frame_count
+        if n == 0:
+            return
+        data = {
+            c: self._frame_buf[c][:n].astype(str) if k == "str" else self._frame_buf[c][:n]
+            for c, k in FRAME_COLUMNS
+        }
+        self.frames.write(data)
+        self._frame_count = 0
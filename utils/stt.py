@@ -1,10 +1,200 @@
 import json
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
 from vosk import Model, KaldiRecognizer
 
-model = Model("models/vosk-model-small-en-us-0.15")
+DEFAULT_MODEL_KEY = "en-us"
 
-def create_recognizer(sr=16000):
-    return KaldiRecognizer(model, sr)
+# Model directories keyed by language or campaign
+MODEL_PATHS = {
+    DEFAULT_MODEL_KEY: "models/vosk-model-small-en-us-0.15",
+}
+
+MODEL_MEMORY_BUDGET_MB = 1024  # Evict least recently used models above this
+
+
+def _model_footprint(path):
+    """Estimate resident memory of a Vosk model from its size on disk (bytes)."""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+class _Entry:
+    def __init__(self, model, footprint, load_time):
+        self.model = model
+        self.footprint = footprint
+        self.load_time = load_time
+        # One token per live recognizer; set add/discard are atomic under the GIL
+        self.pins = set()
+
+    def in_use(self):
+        return len(self.pins) > 0
+
+
+class ModelRegistry:
+    """
+    Loads Vosk models on demand and keeps them within a memory budget.
+
+    Models are keyed by language or campaign and are only handed out through
+    recognizers. When the estimated resident memory exceeds the budget, the
+    least recently used models are evicted, skipping any model that still has
+    live recognizers.
+    """
+    def __init__(self, paths=None, memory_budget_mb=MODEL_MEMORY_BUDGET_MB):
+        self.paths = dict(MODEL_PATHS if paths is None else paths)
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self._models = OrderedDict()
+        self._loading = {}  # key -> bytes reserved for a load in progress
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.over_budget_loads = 0  # Loads that left the registry over budget
+
+    def register(self, key, path):
+        """
+        Add or replace the model directory used for `key`.
+
+        Replacing drops an idle cached model so the next recognizer loads the
+        new directory. A model that is loading or still has live recognizers
+        cannot be replaced.
+        """
+        with self._lock:
+            if self.paths.get(key) == path:
+                return
+            entry = self._models.get(key)
+            if key in self._loading or (entry is not None and entry.in_use()):
+                raise ValueError(f"STT model '{key}' is in use and cannot be replaced")
+            if entry is not None:
+                del self._models[key]
+            self.paths[key] = path
+
+    def create_recognizer(self, key=DEFAULT_MODEL_KEY, sr=16000):
+        """Create a recognizer that pins its model until it is garbage collected."""
+        with self._cond:
+            # Another thread may already be loading this key; wait for it
+            while key in self._loading:
+                self._cond.wait()
+
+            entry = self._models.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._models.move_to_end(key)
+                recognizer = self._pin(entry, sr)
+                self._evict()
+                return recognizer
+
+            if key not in self.paths:
+                raise KeyError(f"No STT model registered for '{key}'")
+            self.misses += 1
+            self._loading[key] = 0
+            path = self.paths[key]
+
+        # Loading takes seconds, so hits on other keys must not wait for it
+        try:
+            footprint = _model_footprint(path)
+            with self._lock:
+                # Reserve the footprint and make room before the model is
+                # resident, so peak memory stays within the budget
+                self._evict(footprint)
+                self._loading[key] = footprint
+                if self._resident() > self.memory_budget:
+                    self.over_budget_loads += 1
+            start = time.perf_counter()
+            model = Model(path)
+            load_time = time.perf_counter() - start
+        except BaseException:
+            with self._cond:
+                del self._loading[key]
+                self._cond.notify_all()
+            raise
+
+        with self._cond:
+            del self._loading[key]
+            self._cond.notify_all()
+            entry = _Entry(model, footprint, load_time)
+            self._models[key] = entry
+            return self._pin(entry, sr)
+
+    def resident_bytes(self):
+        with self._lock:
+            return self._resident()
+
+    def stats(self):
+        """Hit/miss counters, evictions and per-model load latency."""
+        with self._lock:
+            self._evict()
+            lookups = self.hits + self.misses
+            resident = self._resident()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "resident_bytes": resident,
+                "memory_budget_bytes": self.memory_budget,
+                "over_budget": resident > self.memory_budget,
+                "over_budget_loads": self.over_budget_loads,
+                "models": {
+                    key: {
+                        "load_time": e.load_time,
+                        "footprint_bytes": e.footprint,
+                        "recognizers": len(e.pins),
+                    }
+                    for key, e in self._models.items()
+                },
+            }
+
+    def _pin(self, entry, sr):
+        recognizer = KaldiRecognizer(entry.model, sr)
+        token = object()
+        entry.pins.add(token)
+        weakref.finalize(recognizer, self._unpin, entry, token)
+        return recognizer
+
+    def _unpin(self, entry, token):
+        entry.pins.discard(token)
+        # Runs from garbage collection, possibly while this thread holds the
+        # lock; if so, the next lookup or stats() call does the eviction.
+        if self._lock.acquire(blocking=False):
+            try:
+                self._evict()
+            finally:
+                self._lock.release()
+
+    def _resident(self):
+        loaded = sum(e.footprint for e in self._models.values())
+        return loaded + sum(self._loading.values())
+
+    def _evict(self, incoming=0):
+        resident = self._resident()
+        for key in list(self._models):
+            if resident + incoming <= self.memory_budget:
+                break
+            entry = self._models[key]
+            if entry.in_use():
+                continue
+            del self._models[key]
+            resident -= entry.footprint
+            self.evictions += 1
+
+
+registry = ModelRegistry()
+
+
+def create_recognizer(sr=16000, key=DEFAULT_MODEL_KEY):
+    return registry.create_recognizer(key, sr)
 
 def feed_audio(recognizer, frame):
     recognizer.AcceptWaveform((frame * 32768).astype("int16").tobytes())